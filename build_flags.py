@@ -1,11 +1,19 @@
 # coding: utf-8
+import os
 import sys
+import json
+import fnmatch
+import tempfile
 import argparse
 
 import platformio_helpers as pioh
 
 from dropbot import __version__ as DROPBOT_VERSION
 
+# Cache of Arduino include directories (see `include_dirs()`).
+CACHE_PATH = os.path.join(os.path.expanduser('~'), '.platformio',
+                          '.dropbot_includes.json')
+
 
 def parse_args(args=None):
     if args is None:
@@ -19,6 +27,63 @@ def parse_args(args=None):
     return parser.parse_known_args(args=args)
 
 
+def walkdirs(root, ignore):
+    """
+    Recursively list directories under ``root``, skipping (and not descending
+    into) directories with a name matching any of the ``ignore`` patterns.
+    """
+    dirs = []
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if (entry.is_dir() and not any(fnmatch.fnmatch(entry.name, p)
+                                               for p in ignore)):
+                    dirs.append(entry.path)
+                    stack.append(entry.path)
+    return sorted(dirs)
+
+
+def include_dirs(ignore):
+    """
+    List Arduino include directories.
+
+    Traversing the Conda Arduino include tree may be slow, so the result is
+    cached in :data:`CACHE_PATH` and only recomputed when the include root
+    directory is modified (e.g., a library is installed or removed), or the
+    ignore patterns change.
+    """
+    root = str(pioh.conda_arduino_include_path())
+    key = {'root': root, 'mtime': os.stat(root).st_mtime, 'ignore': ignore}
+
+    try:
+        with open(CACHE_PATH, 'r') as input_:
+            cache = json.load(input_)
+        if cache['key'] == key:
+            return cache['dirs']
+    except (IOError, ValueError, KeyError, TypeError):
+        pass
+
+    dirs = walkdirs(root, ignore)
+    try:
+        cache_dir = os.path.dirname(CACHE_PATH)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temporary file and rename it into place so that
+        # concurrent builds never read a partially written cache.
+        with tempfile.NamedTemporaryFile('w', dir=cache_dir, suffix='.tmp',
+                                         delete=False) as output:
+            json.dump({'key': key, 'dirs': dirs}, output)
+        try:
+            os.replace(output.name, CACHE_PATH)
+        except OSError:
+            os.remove(output.name)
+            raise
+    except IOError:
+        # Caching is best effort.
+        pass
+    return dirs
+
+
 if __name__ == '__main__':
     args, extra_args = parse_args()
 
@@ -26,6 +91,6 @@ if __name__ == '__main__':
                    r'-DPACKET_SIZE=1024']
 
     ignore = ['HVSwitchingBoard']
-    extra_args += [f'-I{lib}' for lib in pioh.conda_arduino_include_path().walkdirs(ignore=ignore)]
+    extra_args += [f'-I{lib}' for lib in include_dirs(ignore)]
 
     print(' '.join(extra_args))
@@ -1,11 +1,12 @@
 # coding: utf-8
 import time
 import uuid
-import json_tricks  # Use `json_tricks` instead of `json` to support serializing [Numpy arrays and scalars][1].
+import orjson
 
 import numpy as np
 import datetime as dt
 
+from collections import deque
 from functools import wraps
 
 from path_helpers import path
@@ -13,41 +14,92 @@ from base_node import BaseNode
 
 from . import metadata
 
-__all__ = ['log_results', 'system_info', 'test_system_metrics', 'test_i2c',
-           'test_voltage', 'test_shorts', 'test_on_board_feedback_calibration',
-           'test_channels']
+__all__ = ['CachedProxy', 'log_results', 'system_info', 'test_system_metrics',
+           'test_i2c', 'test_voltage', 'test_shorts',
+           'test_on_board_feedback_calibration', 'test_channels']
 
 ALL_TESTS = ['system_info', 'test_system_metrics', 'test_i2c', 'test_voltage',
              'test_shorts', 'test_on_board_feedback_calibration',
              'test_channels']
 
-# Prevent warning about potential future changes to Numpy scalar encoding
-# behaviour.
-json_tricks.NumpyEncoder.SHOW_SCALAR_WARNING = False
 
+# Proxy attributes saved (and restored) by default by `restore_state`.
+RESTORE_ATTRS = ('hv_output_enabled', 'hv_output_selected', 'state_of_channels',
+                 'voltage', 'frequency')
 
-def restore_state(f):
+
+def restore_state(*attrs):
     """
     Wrapper for restoring state after a test has completed.
+
+    May either be applied directly as a decorator to save and restore all
+    attributes in :data:`RESTORE_ATTRS`, or called with the names of the
+    proxy attributes that the test modifies, e.g.::
+
+        @restore_state('hv_output_enabled', 'voltage')
+        def test_foo(proxy):
+            ...
+
+    Attributes whose value is unchanged after the test are not written back
+    to the device.
+    """
+    if len(attrs) == 1 and callable(attrs[0]):
+        # Decorator was applied without arguments.
+        return restore_state()(attrs[0])
+    attrs = attrs or RESTORE_ATTRS
+
+    def _wrapper(f):
+        @wraps(f)
+        def _decorator(*args, **kwargs):
+            proxy = args[0]
+            # Save state of attributes that we will be modifying.
+            state = tuple((attr_i, getattr(proxy, attr_i)) for attr_i in attrs)
+            try:
+                result = f(*args, **kwargs)
+            finally:
+                # Restore state of attributes that were modified.
+                for attr_i, value_i in state:
+                    if not np.array_equal(getattr(proxy, attr_i), value_i):
+                        setattr(proxy, attr_i, value_i)
+            return result
+
+        return _decorator
+
+    return _wrapper
+
+
+class CachedProxy:
     """
+    Wrapper around a proxy which caches reads of attributes that are constant
+    for the duration of a test run (e.g., ``config``, ``properties``).
 
-    @wraps(f)
-    def _decorator(*args, **kwargs):
-        proxy = args[0]
-        # Save state of attributes that we will be modifying.
-        state = {attr_i: getattr(proxy, attr_i)
-                 for attr_i in ('hv_output_enabled', 'hv_output_selected',
-                                'state_of_channels', 'voltage',
-                                'frequency')}
-        try:
-            result = f(*args, **kwargs)
-        finally:
-            # Restore state of attributes that we were modified.
-            for attr_i, value_i in state.items():
-                setattr(proxy, attr_i, value_i)
-        return result
+    All other attribute reads and writes are forwarded to the wrapped proxy.
+    The cached ``config`` is invalidated by :meth:`update_config`.
 
-    return _decorator
+    Parameters
+    ----------
+    proxy : Proxy
+    """
+    CACHED_ATTRS = ('config', 'properties')
+
+    def __init__(self, proxy):
+        object.__setattr__(self, '_proxy', proxy)
+        object.__setattr__(self, '_cache', {})
+
+    def __getattr__(self, name):
+        if name in self.CACHED_ATTRS:
+            if name not in self._cache:
+                self._cache[name] = getattr(self._proxy, name)
+            return self._cache[name]
+        return getattr(self._proxy, name)
+
+    def __setattr__(self, name, value):
+        self._cache.pop(name, None)
+        setattr(self._proxy, name, value)
+
+    def update_config(self, *args, **kwargs):
+        self._cache.pop('config', None)
+        return self._proxy.update_config(*args, **kwargs)
 
 
 def time_it(f):
@@ -67,6 +119,63 @@ def time_it(f):
     return _decorator
 
 
+def _wait_stable(proxy, target, tol=0.02, timeout=0.5, min_poll=0.01):
+    """
+    Wait for the measured high-voltage output to settle at a target voltage.
+
+    Poll :meth:`measure_voltage` until the mean of the three most recent
+    readings is within ``tol`` (relative) of ``target`` *and* their relative
+    standard deviation is below ``tol``, or until ``timeout`` elapses.
+
+    Parameters
+    ----------
+    proxy : Proxy
+    target : float
+        Target output voltage.
+    tol : float, optional
+        Relative tolerance (default: 0.02, i.e., 2%).
+    timeout : float, optional
+        Maximum number of seconds to wait (default: 0.5).
+    min_poll : float, optional
+        Seconds to wait between readings (default: 0.01).
+
+    Returns
+    -------
+    bool
+        ``True`` if the output voltage settled before the time out.
+    """
+    samples = deque(maxlen=3)
+    deadline = time.monotonic() + timeout
+    while True:
+        samples.append(proxy.measure_voltage())
+        if len(samples) == samples.maxlen:
+            mean = np.mean(samples)
+            if (mean > 0 and abs(mean - target) / target < tol and
+                    np.std(samples) / mean < tol):
+                return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(min_poll)
+
+
+def _json_default(value):
+    """
+    Serialize types not natively supported by :mod:`orjson`.
+    """
+    if isinstance(value, (np.generic, np.ndarray)):
+        return value.tolist()
+    elif isinstance(value, uuid.UUID):
+        return str(value)
+    elif isinstance(value, dt.datetime):
+        return value.isoformat()
+    elif isinstance(value, complex):
+        return [value.real, value.imag]
+    elif hasattr(value, 'to_dict'):
+        # e.g., `pandas.Series` or `pandas.DataFrame`
+        return value.to_dict()
+    raise TypeError(f'Type is not JSON serializable: {type(value).__name__}')
+
+
 def log_results(results, output_dir):
     """
     .. versionchanged:: 1.28
@@ -74,6 +183,12 @@ def log_results(results, output_dir):
 
         .. _json_tricks.dumps: http://json-tricks.readthedocs.io/en/latest/#dumps
 
+    .. versionchanged:: 1.74.0
+        Use :func:`orjson.dumps` to dump results.  Note that the output format
+        changed: numpy arrays are written as plain JSON lists (rather than
+        json_tricks ``__ndarray__`` objects) and numpy scalars as plain
+        numbers.
+
     Parameters
     ----------
     results : dict
@@ -86,21 +201,24 @@ def log_results(results, output_dir):
     # Make output directory if it doesn't exist.
     output_dir.makedirs(exist_ok=True)
 
-    # Construct filename based on current UTC date and time.
-    current_time = dt.datetime.now(dt.timezone.utc).isoformat().replace(':', '.')
-    filepath = output_dir.joinpath(f'results-{current_time}.json')
+    # Construct filename based on starting time of earliest test (or current
+    # UTC date and time if no timestamp is available).
+    timestamps = [result_i['utc_timestamp'] for result_i in results.values()
+                  if isinstance(result_i, dict) and 'utc_timestamp' in result_i]
+    timestamp = (min(timestamps) if timestamps else
+                 dt.datetime.now(dt.timezone.utc).isoformat())
+    filepath = output_dir.joinpath(f'results-{timestamp.replace(":", ".")}.json')
 
     # write the results to a file
-    with filepath.open('w') as output:
-        # XXX Use `json_tricks` rather than standard `json` to support
-        # serializing [Numpy arrays and scalars][1].
-        #
-        # [1]: http://json-tricks.readthedocs.io/en/latest/#numpy-arrays
-        json_tricks.dump(results, output)
+    # XXX `OPT_NON_STR_KEYS` is required since, e.g., `test_i2c` results are
+    # keyed by integer i2c address.
+    filepath.write_bytes(orjson.dumps(results, default=_json_default,
+                                      option=orjson.OPT_SERIALIZE_NUMPY |
+                                      orjson.OPT_NON_STR_KEYS |
+                                      orjson.OPT_INDENT_2))
 
 
 @time_it
-@restore_state
 def system_info(proxy):
     """
     Get system info (e.g., control board uuid, config,
@@ -128,7 +246,6 @@ def system_info(proxy):
 
 
 @time_it
-@restore_state
 def test_i2c(proxy):
     """
     Get metadata for all of the devices on the i2c bus.
@@ -149,12 +266,13 @@ def test_i2c(proxy):
         Split using byte strings to support Python 3.
     """
     results = {'i2c_scan': {}}
+    i2c_address = proxy.config.i2c_address
     for address in proxy.i2c_scan():
         if address in [32, 33, 34]:
             node = BaseNode(proxy, int(address))
-            info = {'name': node.name().split(b'\0', 1)[0].decode("utf-8"),
-                    'hardware_version': node.hardware_version().split(b'\0', 1)[0].decode("utf-8"),
-                    'software_version': node.software_version().split(b'\0', 1)[0].decode("utf-8"),
+            info = {'name': node.name().partition(b'\0')[0].decode("utf-8"),
+                    'hardware_version': node.hardware_version().partition(b'\0')[0].decode("utf-8"),
+                    'software_version': node.software_version().partition(b'\0')[0].decode("utf-8"),
                     'uuid': str(node.uuid)}
             results['i2c_scan'].update({int(address): info})
         elif address in [80, 81]:
@@ -165,7 +283,7 @@ def test_i2c(proxy):
                     'hardware_version': board.version,
                     'uuid': str(uuid.UUID(bytes=board.uuid))}
             results['i2c_scan'].update({int(address): info})
-        elif address == proxy.config.i2c_address:
+        elif address == i2c_address:
             pass
         else:
             results['i2c_scan'].update({int(address): {}})
@@ -173,7 +291,7 @@ def test_i2c(proxy):
 
 
 @time_it
-@restore_state
+@restore_state('hv_output_enabled', 'hv_output_selected', 'voltage')
 def test_voltage(proxy, n=5, delay=0.1):
     """
     Test the measured voltage for a range of target voltages.
@@ -187,27 +305,29 @@ def test_voltage(proxy, n=5, delay=0.1):
     n : int
         Number of voltages to measure between minimum and maximum voltage.
     delay : float
-        Seconds between measurements.
+        Maximum seconds to wait for the output voltage to settle before each
+        measurement (at least 0.2 s is allowed).
 
     Returns
     -------
     dict
-        target_voltage : list
-            List of target voltages.
-        measured_voltage : list
-            List of measured voltages.
+        target_voltage : numpy.ndarray
+            Array of target voltages.
+        measured_voltage : numpy.ndarray
+            Array of measured voltages.
         delay : float
-            Seconds between measurements.
+            Maximum seconds to wait for the output voltage to settle before
+            each measurement.
         input_voltage : float
             Input voltage from the power supply.
-        input_current : float
+        input_current : numpy.ndarray
             Input current (in Amps) to the boost converter.
-        input_current_no_load : float
+        input_current_no_load : numpy.ndarray
             Input current (in Amps) to the boost converter when the
             high-voltage output is not selected.
-        output_current : float
+        output_current : numpy.ndarray
             Output current (in Amps) from the boost converter.
-        output_current_no_load
+        output_current_no_load : numpy.ndarray
             Output current (in Amps) from the boost converter when the
             high-voltage output is not selected.
 
@@ -219,46 +339,46 @@ def test_voltage(proxy, n=5, delay=0.1):
     .. versionchanged:: 1.46
         Add input_current_no_load and output_current_no_load measurements.
     """
+    # Each read of the waveform voltage limits is a round-trip to the device.
+    v_min = proxy.min_waveform_voltage
+    v_max = proxy.max_waveform_voltage
+    target_voltage = np.linspace(v_min, v_max, n)
+
     proxy.hv_output_enabled = True
     proxy.hv_output_selected = True
-    measured_voltage = []
-    input_current = []
-    output_current = []
+    measured_voltage = np.empty(n)
+    input_current = np.empty(n)
+    output_current = np.empty(n)
 
     # Wait for the voltage to stabilize
-    proxy.voltage = proxy.min_waveform_voltage
-    time.sleep(1)
+    proxy.voltage = v_min
+    _wait_stable(proxy, v_min, timeout=1.0)
 
     input_voltage = proxy.measure_input_voltage()
 
-    target_voltage = np.linspace(proxy.min_waveform_voltage, proxy.max_waveform_voltage, n)
-    for v in target_voltage:
+    for i, v in enumerate(target_voltage):
         proxy.voltage = v
-        time.sleep(delay)
-        measured_voltage.append(proxy.measure_voltage())
-        results = proxy.measure_input_current()
-        input_current.append(results['rms'])
-        results = proxy.measure_output_current()
-        output_current.append(results['rms'])
+        _wait_stable(proxy, v, timeout=max(delay, 0.2))
+        measured_voltage[i] = proxy.measure_voltage()
+        input_current[i] = proxy.measure_input_current()['rms']
+        output_current[i] = proxy.measure_output_current()['rms']
 
     # Perform the same test with the high-voltage output de-selected
     proxy.hv_output_selected = False
-    measured_voltage_no_load = []
-    input_current_no_load = []
-    output_current_no_load = []
+    measured_voltage_no_load = np.empty(n)
+    input_current_no_load = np.empty(n)
+    output_current_no_load = np.empty(n)
 
     # Wait for the voltage to stabilize
-    proxy.voltage = proxy.min_waveform_voltage
-    time.sleep(1)
+    proxy.voltage = v_min
+    _wait_stable(proxy, v_min, timeout=1.0)
 
-    for v in target_voltage:
+    for i, v in enumerate(target_voltage):
         proxy.voltage = v
-        time.sleep(delay)
-        measured_voltage_no_load.append(proxy.measure_voltage())
-        results = proxy.measure_input_current()
-        input_current_no_load.append(results['rms'])
-        results = proxy.measure_output_current()
-        output_current_no_load.append(results['rms'])
+        _wait_stable(proxy, v, timeout=max(delay, 0.2))
+        measured_voltage_no_load[i] = proxy.measure_voltage()
+        input_current_no_load[i] = proxy.measure_input_current()['rms']
+        output_current_no_load[i] = proxy.measure_output_current()['rms']
 
     return {'target_voltage': target_voltage,
             'measured_voltage': measured_voltage,
@@ -292,7 +412,8 @@ def test_shorts(proxy):
 
 
 @time_it
-@restore_state
+@restore_state('hv_output_enabled', 'hv_output_selected', 'state_of_channels',
+               'voltage')
 def test_on_board_feedback_calibration(proxy, n_reps=10):
     """
     Measure the on-board feedback capacitors.
@@ -314,6 +435,16 @@ def test_on_board_feedback_calibration(proxy, n_reps=10):
     .. versionchanged:: 1.46
         Add n_reps argument (default=10).
         Return 'c' as a numpy.ndarray instead of list.
+
+    .. versionchanged:: 1.74.0
+        Measure on the device using :meth:`Proxy.capacitance` (as in
+        :meth:`Proxy.on_board_capacitance`), rather than
+        :meth:`Proxy.measure_capacitance`.  Note that this changes the
+        capacitance estimator: the firmware uses the difference between the
+        25th and 75th percentiles of differential (A10/A11) readings over
+        ``config.capacitance_n_samples`` samples, instead of the host-side
+        ``filtered_mean`` of 50 single-ended (A11) samples.  Results are
+        therefore not directly comparable with reports from earlier versions.
     """
     proxy.voltage = 100
     proxy.hv_output_enabled = True
@@ -324,7 +455,7 @@ def test_on_board_feedback_calibration(proxy, n_reps=10):
     for rep in range(n_reps):
         for i, capacitor_index in enumerate([-1, 0, 1, 2]):
             proxy.select_on_board_test_capacitor(capacitor_index)
-            c[i, rep] = proxy.measure_capacitance()
+            c[i, rep] = proxy.capacitance(0)
 
     proxy.select_on_board_test_capacitor(-1)
 
@@ -332,7 +463,8 @@ def test_on_board_feedback_calibration(proxy, n_reps=10):
 
 
 @time_it
-@restore_state
+@restore_state('hv_output_enabled', 'hv_output_selected', 'state_of_channels',
+               'voltage')
 def test_channels(proxy, n_reps=1, test_channels=None, shorts=None):
     """
     Test all channels using the test board.
@@ -358,7 +490,20 @@ def test_channels(proxy, n_reps=1, test_channels=None, shorts=None):
         c : numpy.array
             [m x n] array of measured capacitance values where m
             is the number of channels tested and n is the number
-            of replicates.
+            of replicates.  Shorted channels are not measured (i.e., are
+            zero).
+
+    .. versionchanged:: 1.74.0
+        Measure all channels on the device using
+        :meth:`Proxy.channel_capacitances` (a single request per replicate),
+        rather than :meth:`Proxy.measure_capacitance` for each channel.  Note
+        that this changes the capacitance estimator: the firmware uses the
+        difference between the 25th and 75th percentiles of differential
+        (A10/A11) readings over ``config.capacitance_n_samples`` samples,
+        instead of the host-side ``filtered_mean`` of 50 single-ended (A11)
+        samples.  Channels disabled in firmware are reported as zero.
+        Results are therefore not directly comparable with reports from
+        earlier versions.
     """
     n_channels = proxy.number_of_channels
     if not shorts:
@@ -372,14 +517,17 @@ def test_channels(proxy, n_reps=1, test_channels=None, shorts=None):
 
     c = np.zeros([len(test_channels), n_reps])
 
+    shorts_set = set(shorts)
+    # Indices (into `test_channels`) of channels without shorts.
+    measured = np.array([i for i, channel_i in enumerate(test_channels)
+                         if channel_i not in shorts_set], dtype=int)
+    channels = np.asarray(test_channels)[measured].astype(np.uint8)
+
+    # Scan all channels in a single request per replicate, rather than
+    # setting the state of and measuring each channel with separate
+    # round-trips.
     for j in range(n_reps):
-        for i, channel_i in enumerate(test_channels):
-            if channel_i in shorts:
-                continue
-            state = np.zeros(n_channels)
-            state[channel_i] = 1
-            proxy.state_of_channels = state
-            c[i, j] = proxy.measure_capacitance()
+        c[measured, j] = proxy.channel_capacitances(channels).values
 
     return {'test_channels': test_channels,
             'shorts': shorts,
@@ -9,7 +9,7 @@ Example
 
     import dropbot as db
     import dropbot.move
-    import trollius as asyncio
+    import asyncio
 
     route = [110, 109, 115, 114, 115, 109, 110]
 
@@ -23,9 +23,8 @@ Example
     # seconds of actuation before attempting to retry.
     task = db.move.move_liquid(proxy, route, min_duration=.3,
                                wrapper=ft.partial(asyncio.wait_for, timeout=5))
-    loop = asyncio.get_event_loop()
     # Collect DropBot `capacitance-updated` messages.
-    messages = loop.run_until_complete(task)
+    messages = db.move.run(task)
     # Disable DropBot capacitance updates.
     proxy.update_state(capacitance_update_interval_ms=0)
     proxy.turn_off_all_channels()
@@ -39,13 +38,21 @@ import networkx as nx
 import functools as ft
 import itertools as it
 
+from collections import deque
 from typing import Optional, Union
 
 from .proxy import SerialProxy, dropbot_state, EVENT_CHANNELS_UPDATED
 
-__all__ = ['MoveTimeout', 'actuate', 'actuate_channels', 'gather_liquid',
-           'load', 'move_liquid', 'move_results_to_frame', 'test_steady_state',
-           'wait_on_capacitance', 'window']
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+logger = logging.getLogger(name=__name__)
+
+__all__ = ['CapacitanceMessages', 'MoveTimeout', 'actuate', 'actuate_channels',
+           'gather_liquid', 'load', 'move_liquid', 'move_results_to_frame',
+           'run', 'test_steady_state', 'wait_on_capacitance', 'window']
 
 
 class MoveTimeout(asyncio.TimeoutError):
@@ -66,6 +73,99 @@ class MoveTimeout(asyncio.TimeoutError):
         super().__init__(*args, **kwargs)
 
 
+def _resync(name: str) -> callable:
+    """
+    Wrap in-place ``list`` method to rebuild `CapacitanceMessages` numpy
+    arrays after the list is modified.
+    """
+    def _method(self, *args, **kwargs):
+        result = getattr(list, name)(self, *args, **kwargs)
+        self._sync()
+        return result
+    _method.__name__ = name
+    _method.__doc__ = getattr(list, name).__doc__
+    return _method
+
+
+class CapacitanceMessages(list):
+    """
+    List of DropBot ``capacitance-updated`` messages.
+
+    In addition to the messages themselves, the ``new_value`` and ``time_us``
+    fields of each appended message are stored in contiguous numpy arrays,
+    so callbacks (e.g., `test_steady_state()`) may operate on them directly
+    without iterating over the message dictionaries.
+
+    Appending is amortized constant time; other in-place modifications (e.g.,
+    :meth:`insert`, :meth:`pop`, ``del``) rebuild the numpy arrays from the
+    list.  Pickles as a plain list of messages, with the numpy arrays rebuilt
+    on load.
+
+    Parameters
+    ----------
+    capacity : int, optional
+        Initial capacity of the numpy arrays (doubled as necessary).
+    """
+
+    def __init__(self, capacity: int = 256):
+        super().__init__()
+        self._new_value = np.empty(capacity)
+        self._time_us = np.empty(capacity, dtype=np.int64)
+
+    def __reduce__(self):
+        # XXX The default protocol restores list items _before_ instance
+        # attributes, i.e., `append()` would be called before the numpy
+        # arrays exist.  Construct using `__init__()` instead.
+        return type(self), (), None, iter(self)
+
+    def _sync(self) -> None:
+        """Rebuild numpy arrays from the list of messages."""
+        self._new_value = np.fromiter((m['new_value'] for m in self),
+                                      dtype=float, count=len(self))
+        self._time_us = np.fromiter((m['time_us'] for m in self),
+                                    dtype=np.int64, count=len(self))
+
+    def append(self, message: dict) -> None:
+        n = len(self)
+        if n == self._new_value.shape[0]:
+            grow = max(n, 1)
+            self._new_value = np.concatenate([self._new_value,
+                                              np.empty(grow)])
+            self._time_us = np.concatenate([self._time_us,
+                                            np.empty(grow, dtype=np.int64)])
+        self._new_value[n] = message['new_value']
+        self._time_us[n] = message['time_us']
+        super().append(message)
+
+    def extend(self, messages) -> None:
+        for message in messages:
+            self.append(message)
+
+    def __iadd__(self, messages):
+        self.extend(messages)
+        return self
+
+    __setitem__ = _resync('__setitem__')
+    __delitem__ = _resync('__delitem__')
+    __imul__ = _resync('__imul__')
+    insert = _resync('insert')
+    pop = _resync('pop')
+    remove = _resync('remove')
+    clear = _resync('clear')
+    sort = _resync('sort')
+    reverse = _resync('reverse')
+
+    @property
+    def new_value(self) -> np.ndarray:
+        """Capacitance value (in Farads) of each message."""
+        return self._new_value[:len(self)]
+
+    @property
+    def time_us(self) -> np.ndarray:
+        """DropBot microsecond counter value of each message."""
+        return self._time_us[:len(self)]
+
+
 def window(seq: Union[list, np.array], n: int):
     """
     Returns
@@ -76,12 +176,12 @@ def window(seq: Union[list, np.array], n: int):
             s -> (s0,s1,...s[n-1]), (s1,s2,...,sn), ...
     """
     it_ = iter(seq)
-    result = tuple(it.islice(it_, n))
-    if len(result) == n:
-        yield result
+    window_ = deque(it.islice(it_, n), maxlen=n)
+    if len(window_) == n:
+        yield tuple(window_)
     for elem in it_:
-        result = result[1:] + (elem,)
-        yield result
+        window_.append(elem)
+        yield tuple(window_)
 
 
 async def wait_on_capacitance(proxy_: SerialProxy, callback: callable) -> list:
@@ -97,7 +197,7 @@ async def wait_on_capacitance(proxy_: SerialProxy, callback: callable) -> list:
 
     Returns
     -------
-    list
+    CapacitanceMessages
         List of DropBot ``capacitance-updated`` messages containing the
         following keys::
 
@@ -110,7 +210,7 @@ async def wait_on_capacitance(proxy_: SerialProxy, callback: callable) -> list:
     move_done = asyncio.Event()
     loop = asyncio.get_event_loop()
 
-    messages = []
+    messages = CapacitanceMessages()
 
     def _on_capacitance(message):
         # message.keys == ['event', 'new_value', 'time_us', 'n_samples', 'V_a']
@@ -120,7 +220,7 @@ async def wait_on_capacitance(proxy_: SerialProxy, callback: callable) -> list:
             if callback(messages):
                 loop.call_soon_threadsafe(move_done.set)
         except Exception:
-            logging.debug('capacitance event error.', exc_info=True)
+            logger.debug('capacitance event error.', exc_info=True)
             return
 
     proxy_.signals.signal('capacitance-updated').connect(_on_capacitance)
@@ -172,15 +272,18 @@ async def actuate_channels(proxy_: SerialProxy, channels: Union[list, np.array],
     signal = proxy_.signals.signal('channels-updated')
     signal.connect(_on_channels_updated)
 
-    # Request actuation of the specified channels.
-    proxy_.set_state_of_channels(pd.Series(1, index=channels), append=False)
+    # Request actuation of the specified channels (and only those channels).
+    states = np.zeros(proxy_.number_of_channels, dtype=np.uint8)
+    states[np.asarray(channels, dtype=int)] = 1
+    proxy_.set_state_of_channels(states)
 
     await channels_updated.wait()
-    if not allow_disabled and (set(channels_updated.actuated) !=
-                               set(channels)):
+    requested = set(channels)
+    actuated = set(channels_updated.actuated)
+    if not allow_disabled and actuated != requested:
         raise RuntimeError(f'Actuated channels `{channels_updated.actuated}` do not match '
                            f'expected channels `{channels}`')
-    elif set(channels_updated.actuated) - set(channels):
+    elif actuated - requested:
         # Disabled channels are allowed.
         raise RuntimeError(f'Actuated channels `{channels_updated.actuated}` are not included in'
                            f' expected channels `{channels}`')
@@ -196,7 +299,7 @@ def test_steady_state(messages: list, std_error: Optional[float] = .02,
 
     Parameters
     ----------
-    messages : list
+    messages : list or CapacitanceMessages
         List of DropBot ``capacitance-updated`` messages containing the
         following keys::
 
@@ -216,17 +319,33 @@ def test_steady_state(messages: list, std_error: Optional[float] = .02,
         Minimum median capacitance in Farads (from most recent 100 samples)
         before considering steady state as reached.
     """
-    df = pd.DataFrame(messages[-100:])
-    df['time'] = df.time_us * 1e-6
-    df['time'] -= df.time.iloc[0]
-    df.set_index('time', inplace=True)
-    if (df.index.values[-1] - df.index.values[0]) < min_duration:
+    # XXX This callback is evaluated for _every_ `capacitance-updated`
+    # message, so operate on plain numpy arrays rather than constructing a
+    # data frame.
+    if len(messages) < 2:
         return False
-    start = df.index.values[-1] - min_duration
-    std = df.new_value.loc[start:].std()
-    q50 = df.new_value.loc[start:].quantile(q=0.5)
-    result = (std / q50) < std_error
-    return result and (q50 >= threshold)
+    if isinstance(messages, CapacitanceMessages):
+        time_us = messages.time_us[-100:]
+        values = messages.new_value[-100:]
+    else:
+        recent = messages[-100:]
+        time_us = np.fromiter((m['time_us'] for m in recent), dtype=np.int64,
+                              count=len(recent))
+        values = np.fromiter((m['new_value'] for m in recent), dtype=float,
+                             count=len(recent))
+    time_s = time_us * 1e-6
+    if (time_s[-1] - time_s[0]) < min_duration:
+        return False
+    # Timestamps are monotonic, so the most recent `min_duration` seconds of
+    # samples are a contiguous suffix.
+    values = values[np.searchsorted(time_s, time_s[-1] - min_duration):]
+    if values.size < 2:
+        return False
+    q50 = np.median(values)
+    if q50 < threshold:
+        return False
+    std = values.std(ddof=1)
+    return (std / q50) < std_error
 
 
 async def actuate(proxy_: SerialProxy, channels: Union[list, np.array], callback: callable) -> list:
@@ -250,7 +369,8 @@ async def actuate(proxy_: SerialProxy, channels: Union[list, np.array], callback
 
 
 async def move_liquid(proxy_: SerialProxy, route: list, min_duration: Optional[float] = .3,
-                      trail_length: Optional[int] = 1, wrapper: Optional[callable] = None) -> list:
+                      trail_length: Optional[int] = 1, wrapper: Optional[callable] = None,
+                      progress: Optional[callable] = None) -> list:
     """
     Move liquid along specified route (i.e., list of channels).
 
@@ -270,6 +390,11 @@ async def move_liquid(proxy_: SerialProxy, route: list, min_duration: Optional[f
 
         Useful, for example, to apply an actuation timeout using
         `asyncio.wait_for()`.
+    progress : callable, optional
+        Function called with the list of channels about to be actuated,
+        before waiting for each actuation to reach steady state.
+
+        Useful, for example, to report progress in a user interface.
 
     Returns
     -------
@@ -289,19 +414,24 @@ async def move_liquid(proxy_: SerialProxy, route: list, min_duration: Optional[f
         def wrapper(task):
             return task
 
+    def _report(channels):
+        logger.info('Wait for steady state: %s', channels)
+        if progress is not None:
+            progress(channels)
+
     messages_ = []
 
     duration = min_duration
     route_i = 0
     try:
         for route_i in window(route, trail_length + 1):
-            print(f'\r{"Wait for steady state:":<50} {list(route_i)}', end='')
+            _report(list(route_i))
             messages = await wrapper(actuate(proxy_, route_i, ft.partial(test_steady_state,
                                                                          min_duration=duration)))
             messages_.append({'channels': tuple(route_i),
                               'messages': messages})
             head_channels_i = list(route_i[-trail_length:])
-            print(f'\r{"Wait for steady state:":<50} {head_channels_i}', end='')
+            _report(head_channels_i)
             messages = await wrapper(actuate(proxy_, head_channels_i, ft.partial(test_steady_state,
                                                                                  min_duration=duration)))
             messages_.append({'channels': tuple(head_channels_i),
@@ -345,7 +475,7 @@ def move_results_to_frame(move_results: list) -> pd.DataFrame:
 
         import dropbot as db
         import dropbot.move
-        import trollius as asyncio
+        import asyncio
 
         route = [110, 109, 115, 114, 115, 109, 110]
 
@@ -360,9 +490,8 @@ def move_results_to_frame(move_results: list) -> pd.DataFrame:
         task = db.move.move_liquid(proxy, route, min_duration=.3,
                                    wrapper=ft.partial(asyncio.wait_for,
                                    timeout=5))
-        loop = asyncio.get_event_loop()
         # Collect DropBot `capacitance-updated` messages.
-        messages = loop.run_until_complete(task)
+        messages = db.move.run(task)
         # Disable DropBot capacitance updates.
         proxy.update_state(capacitance_update_interval_ms=0)
         proxy.turn_off_all_channels()
@@ -379,16 +508,18 @@ def move_results_to_frame(move_results: list) -> pd.DataFrame:
     # Combine `capacitance-updated` messages collected during each move into a
     # single data frame.
     keys = []
-    frames = []
+    channels = []
+    records = []
     for i, message_i in enumerate(move_results):
-        keys.append('%3d - %s' % (i, message_i['channels']))
-        frames.append(pd.DataFrame(message_i['messages']))
-    df = pd.concat(frames, keys=keys)
-    df.index.levels[0].name = 'channels'
-    df['time (s)'] = df['time_us'] * 1e-6
-    df['time (s)'] -= df['time (s)'].iloc[0]
-    df.set_index('time (s)', append=True, inplace=True)
-    df.reset_index(level=1, drop=True, inplace=True)
+        key_i = '%3d - %s' % (i, message_i['channels'])
+        keys.append(key_i)
+        channels.extend([key_i] * len(message_i['messages']))
+        records.extend(message_i['messages'])
+    df = pd.DataFrame.from_records(records)
+    time_s = df['time_us'].to_numpy() * 1e-6
+    time_s -= time_s[0]
+    df.index = pd.MultiIndex.from_arrays([pd.Categorical(channels, categories=keys),
+                                          time_s], names=['channels', 'time (s)'])
     return df
 
 
@@ -424,13 +555,14 @@ async def load(proxy_: SerialProxy, channels: list, threshold: Optional[float] =
         See `wait_on_capacitance()` for return type.
     """
     # Load starting reservoir.
-    logging.debug(f'Wait for channel `{channels[:1]}` to be loaded')
+    logger.debug('Wait for channel `%s` to be loaded', channels[:1])
     await actuate(proxy_, channels[:-1], ft.partial(test_steady_state,
                                                     min_duration=load_duration,
                                                     threshold=1.1 * threshold))
 
     detach_channels = channels[1:]
-    logging.debug(f'Wait for liquid to detach from edge electrode `{channels[:1]}` to `{detach_channels}`...')
+    logger.debug('Wait for liquid to detach from edge electrode `%s` to `%s`...',
+                 channels[:1], detach_channels)
     messages = await actuate(proxy_, detach_channels, ft.partial(test_steady_state,
                                                                  min_duration=detach_duration,
                                                                  threshold=threshold))
@@ -467,3 +599,34 @@ async def gather_liquid(proxy_: SerialProxy, graph: nx.Graph, sources: list, tar
     with dropbot_state(proxy_, capacitance_update_interval_ms=int(update_interval * 1e3)):
         for source_i in sources:
             await move_liquid(proxy_, nx.shortest_path(graph, source_i, target), wrapper=wrapper)
+
+
+def run(coroutine):
+    """
+    Run coroutine (e.g., `move_liquid()`) to completion in a new event loop.
+
+    If uvloop_ is installed, it is used as the event loop, which reduces the
+    latency of dispatching DropBot events (e.g., ``capacitance-updated``) to
+    the waiting coroutines.
+
+    .. _uvloop: https://github.com/MagicStack/uvloop
+
+    Parameters
+    ----------
+    coroutine
+        Coroutine to run.
+
+    Returns
+    -------
+    object
+        Result returned by the coroutine.
+    """
+    if uvloop is None:
+        return asyncio.run(coroutine)
+    # XXX `uvloop.run()` was added in uvloop 0.18.
+    loop = uvloop.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
@@ -23,13 +23,18 @@ from tqdm import tqdm
 
 from . import NOMINAL_ON_BOARD_CALIBRATION_CAPACITORS
 # Import test functions used by `self_test`.
-from .hardware_test import (ALL_TESTS, system_info, test_system_metrics,
+from .hardware_test import (ALL_TESTS, CachedProxy, system_info,
+                            test_system_metrics,
                             test_i2c, test_voltage, test_shorts,
                             test_on_board_feedback_calibration,
                             test_channels)
 
 ureg = pint.UnitRegistry()
 
+# Prevent warning about potential future changes to Numpy scalar encoding
+# behaviour.
+json_tricks.NumpyEncoder.SHOW_SCALAR_WARNING = False
+
 logger = logging.getLogger(name=__name__)
 
 __all__ = ['format_system_info_results', 'format_test_channels_results',
@@ -38,6 +43,12 @@ __all__ = ['format_system_info_results', 'format_test_channels_results',
            'format_test_shorts_results', 'format_test_system_metrics_results',
            'format_test_voltage_results']
 
+# Test functions available to `self_test`, keyed by name.
+_TESTS = {f.__name__: f for f in (system_info, test_system_metrics, test_i2c,
+                                  test_voltage, test_shorts,
+                                  test_on_board_feedback_calibration,
+                                  test_channels)}
+
 CAPACITANCE_FORMATTER = mpl.ticker.FuncFormatter(lambda x, *args: f"{ureg.Quantity(x, ureg.F).to('pF'):.0f~#P}")
 VOLTAGE_FORMATTER = mpl.ticker.FuncFormatter(lambda x, *args: f"{ureg.Quantity(x, ureg.V):.0f~#P}")
 
@@ -591,16 +602,26 @@ def self_test(proxy, tests=None):
     -------
     dict
         Results from all tests.
+
+    Raises
+    ------
+    ValueError
+        If any of the specified test names are not recognized.
     """
     total_time = 0
 
     if tests is None:
         tests = ALL_TESTS
+    unknown = [test_name_i for test_name_i in tests if test_name_i not in _TESTS]
+    if unknown:
+        raise ValueError(f'Unknown test(s): {", ".join(unknown)}.  Valid tests are: {", ".join(_TESTS)}')
     results = {}
+    # Read constant proxy attributes (e.g., `config`) at most once per run.
+    proxy = CachedProxy(proxy)
 
     for test_name_i in (pbar:= tqdm(tests)):
         pbar.set_description(test_name_i)
-        test_func_i = eval(test_name_i)
+        test_func_i = _TESTS[test_name_i]
         results[test_name_i] = test_func_i(proxy)
         duration_i = results[test_name_i]['duration']
         logger.info('%s: %.1f s', test_name_i, duration_i)
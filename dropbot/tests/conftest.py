@@ -0,0 +1,62 @@
+import os
+
+import base_node_rpc as bnr
+import pytest
+
+from dropbot.proxy import SerialProxy, NoPower, I2cAddressNotSet
+
+
+def dropbot_ports():
+    '''
+    Returns
+    -------
+    list[str]
+        Sorted list of serial ports of connected DropBots.
+
+    Devices are identified the same way as in :class:`SerialProxy` (i.e., by
+    querying the device name), since other Teensy serial devices share the
+    DropBot USB vendor/product ID.
+    '''
+    df_devices = bnr.available_devices(timeout=.05)
+    if not df_devices.shape[0]:
+        return []
+    return sorted(df_devices.loc[df_devices.device_name == 'dropbot'].index)
+
+
+@pytest.fixture(scope='session')
+def port():
+    '''
+    Serial port of DropBot to test.
+
+    When running tests in parallel using ``pytest-xdist`` (e.g., ``pytest -n
+    2``) with multiple DropBots connected, each worker is assigned a
+    different DropBot; running more workers than connected DropBots fails.
+    Otherwise, ``None`` (i.e., auto-detect).
+    '''
+    worker_id = os.environ.get('PYTEST_XDIST_WORKER')  # e.g., `gw0`
+    if worker_id is None:
+        return None
+
+    ports = dropbot_ports()
+    worker_count = int(os.environ.get('PYTEST_XDIST_WORKER_COUNT', 1))
+    if worker_count > 1 and worker_count > len(ports):
+        pytest.fail(f'{worker_count} xdist workers requested, but only '
+                    f'{len(ports)} DropBots are connected.')
+    if len(ports) < 2:
+        return None
+    return ports[int(worker_id[len('gw'):])]
+
+
+@pytest.fixture(scope='session')
+def proxy(port):
+    '''
+    .. versionchanged:: 1.27.1
+        Ignore non-critical exceptions during initialization to allow tests to
+        run on standalone control board hardware (i.e., not connected to power
+        or I2C bus).
+    '''
+    # XXX Ignore non-critical exceptions during initialization.
+    proxy_ = SerialProxy(port=port, ignore=[NoPower,
+                                            I2cAddressNotSet])
+    yield proxy_
+    proxy_.terminate()
@@ -0,0 +1,87 @@
+import functools as ft
+import pickle
+
+import numpy as np
+import pytest
+
+# XXX Import module (not functions) so pytest does not collect
+# `test_steady_state()` as a test.
+import dropbot.move as move
+
+
+def _messages(seed=0, count=300):
+    '''
+    Synthetic ``capacitance-updated`` messages settling to a steady state.
+    '''
+    random = np.random.RandomState(seed)
+    time_us = np.cumsum(random.randint(5000, 30000, size=count))
+    values = 20e-12 * (1 - np.exp(-np.arange(count) / 40.))
+    values += random.normal(scale=.2e-12, size=count)
+    return [{'event': 'capacitance-updated', 'new_value': v, 'time_us': t,
+             'n_samples': 10, 'V_a': 100.}
+            for v, t in zip(values, time_us)]
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'min_duration': 1.},
+                                    {'std_error': .1, 'threshold': 1e-12}])
+def test_steady_state_capacitance_messages(kwargs):
+    '''
+    Verify `test_steady_state()` result is the same for a plain list and for
+    `CapacitanceMessages`.
+    '''
+    callback = ft.partial(move.test_steady_state, **kwargs)
+    messages = _messages()
+    plain = []
+    capacitance_messages = move.CapacitanceMessages(capacity=0)
+    results = []
+    for message in messages:
+        plain.append(message)
+        capacitance_messages.append(message)
+        result = callback(capacitance_messages)
+        assert result == callback(plain)
+        results.append(result)
+    # Both steady and non-steady states are covered.
+    assert any(results) and not all(results)
+
+
+def _assert_synced(capacitance_messages):
+    np.testing.assert_array_equal(capacitance_messages.new_value,
+                                  [m['new_value'] for m in capacitance_messages])
+    np.testing.assert_array_equal(capacitance_messages.time_us,
+                                  [m['time_us'] for m in capacitance_messages])
+
+
+def test_capacitance_messages_sync():
+    messages = _messages(count=10)
+    capacitance_messages = move.CapacitanceMessages(capacity=1)
+    capacitance_messages.extend(messages[:5])
+    capacitance_messages += messages[5:]
+    assert capacitance_messages == messages
+    _assert_synced(capacitance_messages)
+
+    # Verify numpy arrays are rebuilt after in-place list modifications.
+    for modify in (lambda m: m.insert(0, messages[-1]),
+                   lambda m: m.__setitem__(slice(2, 4), messages[:1]),
+                   lambda m: m.__delitem__(0), lambda m: m.pop(),
+                   lambda m: m.remove(messages[3]), lambda m: m.reverse(),
+                   lambda m: m.sort(key=lambda x: x['new_value']),
+                   lambda m: m.__imul__(2), lambda m: m.append(messages[0]),
+                   lambda m: m.clear(), lambda m: m.append(messages[0])):
+        modify(capacitance_messages)
+        _assert_synced(capacitance_messages)
+
+
+def test_capacitance_messages_pickle():
+    messages = _messages(count=10)
+    capacitance_messages = move.CapacitanceMessages()
+    capacitance_messages.extend(messages)
+    # e.g., `move_liquid()` results.
+    results = [{'channels': [1, 2], 'messages': capacitance_messages}]
+
+    loaded = pickle.loads(pickle.dumps(results))
+    loaded_messages = loaded[0]['messages']
+    assert isinstance(loaded_messages, move.CapacitanceMessages)
+    assert loaded_messages == messages
+    _assert_synced(loaded_messages)
+    loaded_messages.append(messages[0])
+    _assert_synced(loaded_messages)
@@ -1,19 +1,92 @@
 import logging
 import time
 
+import numpy as np
 import pytest
 import serial
 from six.moves import range
-from dropbot.proxy import SerialProxy, NoPower, I2cAddressNotSet
 
 # Watchdog enable bit mask
 WDOG_STCTRLH_WDOGEN = 0x01
 
+# Last known state of the watchdog enable bit (`None` if unknown, e.g., after
+# a reboot).  Updated by tests which enable/disable the watchdog.
+_watchdog_enabled = {'v': None}
+
+
+def _is_watchdog_enabled(proxy, force=False):
+    '''
+    Return cached state of the watchdog enable bit, reading the
+    ``WDOG_STCTRLH`` register only if the state is unknown or ``force`` is
+    set.
+    '''
+    if force or _watchdog_enabled['v'] is None:
+        WDOG_STCTRLH = proxy.R_WDOG_STCTRLH()
+        _watchdog_enabled['v'] = bool(WDOG_STCTRLH & WDOG_STCTRLH_WDOGEN)
+    return _watchdog_enabled['v']
+
+
+def _wait_disconnect(proxy, deadline, interval=0.02):
+    '''
+    Poll device until serial connection is lost or the (monotonic) deadline
+    is reached.
+
+    Returns
+    -------
+    bool
+        ``True`` if serial connection was lost before the deadline.
+    '''
+    while time.monotonic() < deadline:
+        try:
+            proxy.ram_free()
+        except serial.SerialException:
+            return True
+        time.sleep(interval)
+    return False
+
+
+def _wait_ready(proxy, timeout, interval=0.005):
+    '''
+    Poll device with a cheap request until it responds (serial errors are
+    treated as not ready), or until the time out (in seconds) is reached.
+
+    Returns
+    -------
+    bool
+        ``True`` if device responded before the time out.
+    '''
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            proxy.ram_free()
+            return True
+        except (serial.SerialException, IOError):
+            if time.monotonic() >= deadline:
+                return False
+        time.sleep(interval)
+
+
+def _reconnect(proxy, time_out=2., min_delay=0.01, max_delay=0.5):
+    '''
+    Re-establish serial connection to the device, retrying with exponential
+    backoff until connected or the time out is reached.
+    '''
+    deadline = time.monotonic() + time_out
+    delay = min_delay
+    while True:
+        try:
+            proxy._connect()
+            return
+        except (IOError, ValueError):
+            if time.monotonic() + delay > deadline:
+                raise
+        time.sleep(delay)
+        delay = min(2 * delay, max_delay)
+
 
 @pytest.fixture(autouse=True)
 def restore_watchdog_time_out(proxy):
-    WDOG_STCTRLH = proxy.R_WDOG_STCTRLH()
-    watchdog_enabled = (WDOG_STCTRLH & WDOG_STCTRLH_WDOGEN)
+    watchdog_enabled = _is_watchdog_enabled(proxy)
 
     if watchdog_enabled:
         # Save initial watchdog time out.
@@ -25,30 +98,16 @@ def restore_watchdog_time_out(proxy):
     if watchdog_enabled:
         # Restore initial watchdog time out.
         proxy.watchdog_enable(0, initial_time_out)
-        time.sleep(0.1)
-
-
-@pytest.fixture(scope='module')
-def proxy():
-    '''
-    .. versionchanged:: 1.27.1
-        Ignore non-critical exceptions during initialization to allow tests to
-        run on standalone control board hardware (i.e., not connected to power
-        or I2C bus).
-    '''
-
-
-    # XXX Ignore non-critical exceptions during initialization.
-    proxy_ = SerialProxy(ignore=[NoPower,
-                                    I2cAddressNotSet])
-    yield proxy_
-    proxy_.terminate()
+        _watchdog_enabled['v'] = True
+        # XXX No settling time is needed: `watchdog_enable` writes the
+        # watchdog configuration registers before the request returns.
 
 
 @pytest.mark.parametrize('retry_count', [1, 5])
 def test_disable(proxy, retry_count):
     # Reboot to reach known state.
     proxy.reboot()
+    _watchdog_enabled['v'] = None
 
     # XXX Executing `watchdog_disable` method results in undefined behaviour.
     # XXX Rebooting and retrying to disable the watchdog seems to help.
@@ -59,35 +118,53 @@ def test_disable(proxy, retry_count):
     # [i4]: https://gitlab.com/sci-bots/dropbot.py/issues/4
     for i in range(retry_count):
         proxy.watchdog_disable()
-        timer_output = proxy.watchdog_timer_output()
+        _watchdog_enabled['v'] = None
+        # Allow a short settling window before declaring failure, since most
+        # failures are timing related.
+        deadline = time.monotonic() + 0.05
+        while True:
+            timer_output = proxy.watchdog_timer_output()
+            if timer_output == 0 or time.monotonic() >= deadline:
+                break
+            time.sleep(0.005)
         if timer_output == 0:
             print(f'Disabled on attempt {i + 1}')
             break
-        else:
+        elif i < retry_count - 1:
             # Disabling watchdog was not successful. Reboot and try again.
             proxy.reboot()
+            _watchdog_enabled['v'] = None
     else:
         assert timer_output == 0
 
-    WDOG_STCTRLH = proxy.R_WDOG_STCTRLH()
-    assert not (WDOG_STCTRLH & WDOG_STCTRLH_WDOGEN)
+    assert not _is_watchdog_enabled(proxy, force=True)
 
 
 @pytest.mark.parametrize('time_out', [2000, 5000])
 def test_enable(proxy, time_out):
     # Set watchdog time out.
     proxy.watchdog_enable(0, time_out)
+    _watchdog_enabled['v'] = True
 
     # Disable watchdog refresh to trigger time out.
     proxy.watchdog_auto_refresh(False)
 
     output_count = (time_out - 100) // 10
     print(f'Testing {output_count} times')
-    for _ in range(output_count):
-        timer_output_i = proxy.watchdog_timer_output()
-        assert timer_output_i <= time_out
-        assert timer_output_i >= 0
-    print('Timer output:', timer_output_i)
+    if hasattr(proxy, 'watchdog_timer_output_batch'):
+        # Sample timer output on the device (10 ms apart, i.e., spanning
+        # `time_out - 100` ms), in chunks small enough to fit in a single
+        # packet, rather than one request per sample.
+        samples = np.concatenate([proxy.watchdog_timer_output_batch(min(64, output_count - i), 10000)
+                                  for i in range(0, output_count, 64)])
+    else:
+        # Firmware does not support batched sampling; one request per sample.
+        samples = np.array([proxy.watchdog_timer_output()
+                            for _ in range(output_count)])
+    assert samples.size == output_count
+    assert (samples <= time_out).all()
+    assert (samples >= 0).all()
+    print('Timer output:', samples[-1])
 
     proxy.watchdog_auto_refresh(True)
 
@@ -101,23 +178,19 @@ def test_time_out(proxy):
     # Disable watchdog refresh to trigger time out.
     proxy.watchdog_auto_refresh(False)
 
-    # Wait for watchdog time out.
-    time.sleep(2)
-
-    # Verify that serial connection is lost due to time out.
-    with pytest.raises(serial.SerialException):
-        proxy.ram_free()
+    # Verify that serial connection is lost due to watchdog time out.
+    assert _wait_disconnect(proxy, time.monotonic() + 2.5)
 
     # Explicitly tear down proxy stream state.
     proxy.terminate()
 
-    # Wait for serial port to settle after device reset due to watchdog time out.
-    time.sleep(1)
-
-    # Re-establish serial connection to the device.
-    proxy._connect()
+    # Re-establish serial connection to the device (retry while the serial
+    # port settles after device reset due to watchdog time out).
+    _reconnect(proxy)
+    assert _wait_ready(proxy, 1.)
 
     # Verify that watchdog reset actually occurred.
     end_reset_count = proxy.watchdog_reset_count()
     proxy.watchdog_reset_count_clear(0xffff)
+    _watchdog_enabled['v'] = None
     assert end_reset_count > start_reset_count
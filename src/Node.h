@@ -1895,6 +1895,34 @@ public:
     return result;
   }
 
+  /**
+  * @brief Sample watchdog timer output multiple times in a single request.
+  *
+  * @param n_samples  Number of samples to read (limited by buffer size).
+  * @param stride_us  Microseconds to wait between samples.
+  *
+  * @return Array of watchdog timer output samples.
+  *
+  * @note `loop()` does not run while sampling, so the watchdog is refreshed
+  *   while waiting between samples if automatic refresh is enabled (i.e., to
+  *   avoid a reset for large `n_samples * stride_us`).
+  */
+  UInt32Array watchdog_timer_output_batch(uint16_t n_samples,
+                                          uint32_t stride_us) {
+    auto result = get_type_buffer<UInt32Array>();
+    result.length = std::min<uint32_t>(n_samples, result.length);
+    for (uint32_t i = 0; i < result.length; i++) {
+      if (i > 0) {
+        const uint32_t start_us = micros();
+        while (micros() - start_us < stride_us) {
+          if (watchdog_refresh_) { watchdog_refresh(); }
+        }
+      }
+      result.data[i] = watchdog_timer_output();
+    }
+    return result;
+  }
+
   uint16_t watchdog_reset_count() const { return WDOG_RSTCNT; }
   void watchdog_reset_count_clear(uint16_t mask) { WDOG_RSTCNT = mask; }
 